@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from enum import Enum
-from json import JSONDecodeError, dump, load
+from json import JSONDecodeError, dump, dumps, load, loads
 from pathlib import Path
+from sqlite3 import connect
+from time import time
 
 
 class Role(Enum):
@@ -109,6 +111,104 @@ class ChatHistory:
         return [message for message in self._history if message.role == Role.tool]
 
 
+class SessionStore:
+    """SQLite backed chat history, split into named sessions.
+
+    The database runs in WAL mode and messages are only ever appended, so many processes can read and
+    write the same file at once without overwriting each other's turns. Write transactions are kept short,
+    nothing is locked while waiting on the model."""
+    def __init__(self, file: Path, timeout: float = 30.0) -> None:
+        self._connection = connect(file, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT,
+                tool_calls TEXT,
+                tool_name TEXT,
+                created REAL NOT NULL
+            )"""
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS messages_session ON messages (session, id)")
+
+    def load(self, session: str) -> list[Message]:
+        """Get every message of a session, oldest first."""
+        rows = self._connection.execute(
+            "SELECT role, content, tool_calls, tool_name FROM messages WHERE session = ? ORDER BY id",
+            (session,)
+        )
+        return [
+            dict_to_message({
+                "role": role,
+                "content": content,
+                "tool_calls": loads(tool_calls) if tool_calls is not None else None,
+                "tool_name": tool_name
+            })
+            for role, content, tool_calls, tool_name in rows
+        ]
+
+    def append(self, session: str, messages: list[Message]) -> None:
+        """Appends messages to the end of a session in a single transaction."""
+        if not messages:
+            return
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert(session, messages)
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def import_json(self, session: str, file: Path) -> bool:
+        """Imports an old JSON history file into a session, only if that session is still empty."""
+        history = ChatHistory()
+        history.load(file)
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            exists = self._connection.execute(
+                "SELECT 1 FROM messages WHERE session = ? LIMIT 1", (session,)
+            ).fetchone()
+            if exists is None:
+                self._insert(session, history.get_history())
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+        return exists is None
+
+    def clear(self, session: str) -> None:
+        """Deletes every message of a session."""
+        self._connection.execute("DELETE FROM messages WHERE session = ?", (session,))
+
+    def sessions(self) -> list[str]:
+        """Names of all sessions with at least one message."""
+        rows = self._connection.execute("SELECT DISTINCT session FROM messages ORDER BY session")
+        return [name for (name,) in rows]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _insert(self, session: str, messages: list[Message]) -> None:
+        now = time()
+        self._connection.executemany(
+            "INSERT INTO messages (session, role, content, tool_calls, tool_name, created) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    session,
+                    message.role.name,
+                    message.content,
+                    dumps(message.tool_calls) if message.tool_calls is not None else None,
+                    message.tool_name,
+                    now
+                )
+                for message in messages
+            ]
+        )
+
+
 def dict_to_message(dictionary: dict) -> Message:
     """Converts a message dictionary (from Message) and converts back into a Message object."""
     role = dictionary["role"]
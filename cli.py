@@ -1,18 +1,20 @@
 from pathlib import Path
 from sys import argv
 from requests import HTTPError
-from chat import ChatHistory, Message, Role
+from chat import ChatHistory, Message, Role, SessionStore
 from interface import OllamaInterface
 from tool import ToolHandler
 
 
 class CLI:
-    def __init__(self, model: str = "phi3:medium-128k") -> None:
+    def __init__(self, model: str = "phi3:medium-128k", session: str = "default") -> None:
         self.model = model
+        self.session = session
         self.interface = OllamaInterface()
         self.chat = ChatHistory()
         root = Path("~/OllamaTerminalIntegration/").expanduser().resolve()
-        self.history_path = root / "chat_history_cli.json"
+        self.history_path = root / "chat_history_cli.sqlite3"
+        legacy_history_path = root / "chat_history_cli.json"
         tool_path = root / "Tools"
         self.tools = ToolHandler()
 
@@ -22,11 +24,19 @@ class CLI:
         if not tool_path.exists():
             tool_path.mkdir()
 
-        if not self.history_path.exists():
-            self.chat.save(self.history_path)
+        self.store = SessionStore(self.history_path)
+
+        if legacy_history_path.is_file():
+            try:
+                self.store.import_json("default", legacy_history_path)
+                legacy_history_path.rename(legacy_history_path.with_suffix(".json.bak"))
+            except OSError:
+                pass  # Another process imported it first
 
         self.tools.load_directory(tool_path)
-        self.chat.load(self.history_path)
+        for message in self.store.load(self.session):
+            self.chat.add(message)
+        self._saved = len(self.chat.get_history())
 
     def ask(self, prompt: str, use_chat: bool = True) -> str:
         if not use_chat:
@@ -64,9 +74,15 @@ class CLI:
             response = self.interface.chat(model=self.model, chat=self.chat.get_history(True), tools=self.tools.tools, think=False)
             self.chat.add(response)
         
-        self.chat.save(self.history_path)
+        self.save()
         return response.content
 
+    def save(self) -> None:
+        """Appends the messages added since the last save to the session."""
+        history = self.chat.get_history()
+        self.store.append(self.session, history[self._saved:])
+        self._saved = len(history)
+
     def _handle_tool_call(self, message: Message) -> tuple[list[str], list[str]]:
         calls = message.tool_calls
 
@@ -86,12 +102,21 @@ class CLI:
 
 if __name__ == "__main__":
     def main() -> None:
-        cli = CLI("llama3.2")
+        prompt = argv[1:]
+        session = "default"
+        chat = False
+
+        if prompt[:1] == ['--session']:
+            if len(prompt) < 2:
+                print("You must name a session!")
+                exit(1)
+            session = prompt[1]
+            prompt = prompt[2:]
+
+        cli = CLI("llama3.2", session)
         
         print(cli.chat.get_history())
         print(cli.tools.tools)
-        prompt = argv[1:]
-        chat = False
 
         if prompt == []:
             print("You must have a prompt!")